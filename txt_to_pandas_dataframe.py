@@ -1,13 +1,45 @@
+import numpy as np
 import pandas as pd
-from numpy import isclose
 import matplotlib.pyplot as plt
+import functools
 import os
 
+try:
+    from numba import njit
+except ImportError:  # Numba is optional, the NumPy versions are used without it
+    njit = None
+
 # GitHub Action for testing
 # Black or Flake8 tools pep8 (done)
 # automatic documentation (read the docs)
 
 
+COLUMN_NAMES = [
+    "Modified Julian day no.",
+    "Date",
+    "Milliamp-hours (Sync)",
+    "Milliamp-hours (TS-1)",
+    "Milliamp-hours (TS-2)",
+    "Cumulative milliamp-hours (Sync)",
+    "Cumulative milliamp-hours (TS-1)",
+    "Cumulative milliamp-hours (TS-2)",
+]
+
+PROTON_CHARGE = 1.6e-19
+
+# Unit conversions (Default: MeV -> J and mAh -> A)
+MEV_TO_JOULES = (1e6) * PROTON_CHARGE
+MILLIAMP_HOURS_TO_AMPS = (1e-3) / 86400
+
+# Turns the integrated current into a number of protons in one multiply
+_MILLIAMP_HOURS_TO_NUM_PROTONS = (1e-3) / PROTON_CHARGE
+
+_NANOSECONDS_PER_DAY = 86400 * 10**9
+
+# Every column but Date is numeric, so resampling doesn't need to look for the numeric columns
+_NUMERIC_COLUMNS = [column for column in COLUMN_NAMES if column != "Date"]
+
+
 def text_to_pandas_dataframe(file):
     """
     Grabs the data from the a given beam integrated
@@ -15,21 +47,12 @@ def text_to_pandas_dataframe(file):
     """
     data = pd.read_csv(
         file,
-        delim_whitespace=True,
+        sep=r"\s+",
         skiprows=5,
         header=None,
-        names=[
-            "Modified Julian day no.",
-            "Date",
-            "Milliamp-hours (Sync)",
-            "Milliamp-hours (TS-1)",
-            "Milliamp-hours (TS-2)",
-            "Cumulative milliamp-hours (Sync)",
-            "Cumulative milliamp-hours (TS-1)",
-            "Cumulative milliamp-hours (TS-2)",
-        ],
+        names=COLUMN_NAMES,
     )
-    data["Date"] = pd.to_datetime(data["Date"])
+    data["Date"] = pd.to_datetime(data["Date"], format="%d-%b-%Y")
     return data
 
 
@@ -40,27 +63,44 @@ def find_decreasing_value(data, column):
     """
     Locates where a given column has values that decrease
     """
-    prev_value = 0
-    found = False
-    for i, value in enumerate(data[column].values):
-        if value < prev_value:
-            if not found:
-                print("Found decreasing integrated current at:")
-                found = True
-            # Displays the datetime and column of where the value has decreased
-            print(
-                f"{pd.to_datetime(data['Date'].values[i]).strftime('%d-%b-%Y')} ({column})"
-            )
-        prev_value = value
+    values = data[column].to_numpy()
+
+    # Flags every value smaller than the one before it (the first value is compared against 0)
+    mask = np.empty_like(values, dtype=bool)
+    if values.size:
+        mask[0] = values[0] < 0
+        np.less(values[1:], values[:-1], out=mask[1:])
+    decreasing_indices = np.flatnonzero(mask)
+
+    found = bool(decreasing_indices.size)
+    if found:
+        print("Found decreasing integrated current at:")
+        # Displays the datetime and column of where the value has decreased
+        # (all the dates are formatted in one go rather than one Timestamp at a time)
+        dates = pd.DatetimeIndex(data["Date"].to_numpy()[decreasing_indices])
+        for date in dates.strftime("%d-%b-%Y"):
+            print(f"{date} ({column})")
     return found
 
 
+def _is_monotonic(values):
+    """
+    Checks whether an array never decreases
+    """
+    if values.size < 2:
+        return True
+    is_non_decreasing = values[1:] >= values[:-1]
+    # argmin lands on the first False if there is one
+    return bool(is_non_decreasing[is_non_decreasing.argmin()])
+
+
 def data_integrity_check(data):
     """
     Makes sure the data is in the expected format (will put into another file)
     """
     sorted_checks = [
         "Modified Julian day no.",
+        "Date",
         # "Cumulative milliamp-hours (Sync)", #04-Sep-2005
         # "Cumulative milliamp-hours (TS-1)", #04-Sep-2005
         "Cumulative milliamp-hours (TS-2)",
@@ -69,80 +109,246 @@ def data_integrity_check(data):
     # Checks the expected columns never decrease in value
     for column in sorted_checks:
         # assert not find_decreasing_value(data, column)
-        assert data[column].is_monotonic_increasing, f"{column} is not sorted"
+        assert _is_monotonic(data[column].to_numpy()), f"{column} is not sorted"
 
     # Checks that the Cumulative columns are within error equal to the non cumulative columns when summed up to be cumulative
+    # (the running totals are worked out on every check rather than cached so edits to the dataframe are caught,
+    # and all go into one buffer which is reused for every target)
+    cumulative_sum = np.empty(len(data), dtype=np.float64)
     for target in ("Sync", "TS-1", "TS-2"):
-        assert (
-            isclose(
-                data[f"Milliamp-hours ({target})"].cumsum(),
-                data[f"Cumulative milliamp-hours ({target})"],
-                atol=0.1,
-            )
-        ).all()
+        np.cumsum(data[f"Milliamp-hours ({target})"].to_numpy(), dtype=np.float64, out=cumulative_sum)
+        assert np.allclose(
+            cumulative_sum,
+            data[f"Cumulative milliamp-hours ({target})"].to_numpy(),
+            atol=0.1,
+        ), f"Cumulative milliamp-hours ({target}) doesn't match the summed milliamp-hours"
 
     # Checks that the Date column doesn't have any duplicates
-    assert (
-        not data["Modified Julian day no."].duplicated().any()
-    ), "Duplicated dates found"
+    # (the days are sorted by now so any duplicates have to be next to each other)
+    days = data["Modified Julian day no."].to_numpy()
+    assert not np.any(days[1:] == days[:-1]), "Duplicated dates found"
 
 
-def get_sliced_data(data, start_date, end_date, frequency="Daily", is_averaged=False):
+def load_and_prepare(file):
     """
-    Gets a slice of the database between given dates
+    Grabs the data from a given beam integrated current log file and checks it with
+    data_integrity_check, so a broken log is caught before anything is looked up in it
+    """
+    data = text_to_pandas_dataframe(file)
+    data_integrity_check(data)
+    return data
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_date(date):
+    """
+    Turns a given date into a pandas Timestamp, remembering dates that have already been parsed
+    """
+    return pd.to_datetime(date)
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_date(date, date_format):
+    """
+    Writes a given date out in a given format, remembering dates that have already been formatted
+    """
+    return _parse_date(date).strftime(date_format)
+
+
+def _get_dates_as_integers(data):
+    """
+    Gets the Date column as nanoseconds since the epoch
+    (a view of the column, so it doesn't copy and always matches the dataframe)
+    """
+    return data["Date"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+
+def _get_date_position(data, date):
     """
-    start_date = pd.to_datetime(start_date)
-    end_date = pd.to_datetime(end_date)
-    if start_date not in data["Date"].values:
+    Gets the row number of a given date (None if the date isn't in the data)
+    """
+    # The dates are binary searched as they should be sorted (data_integrity_check makes sure of it),
+    # checking every date if that misses in case the dataframe hasn't been checked or sorted
+    dates = _get_dates_as_integers(data)
+    date = np.datetime64(date, "ns").view(np.int64)
+    position = int(np.searchsorted(dates, date))
+    if position < dates.size and dates[position] == date:
+        return position
+    matches = np.flatnonzero(dates == date)
+    if matches.size:
+        return int(matches[0])
+    return None
+
+
+# The resample rule and aggregation used for each (frequency, is_averaged) pair
+_RESAMPLE_METHODS = {
+    ("Weekly", False): ("W", "sum"),
+    ("Weekly", True): ("W", "mean"),
+    ("Monthly", False): ("ME", "sum"),
+    ("Monthly", True): ("ME", "mean"),
+}
+
+
+def _get_numeric_data(data, start_index, end_index):
+    """
+    Gets the numeric columns of a slice of the database indexed by date, for resampling with pandas
+    """
+    sliced_data = data.iloc[start_index:end_index + 1]
+    numeric_data = sliced_data[_NUMERIC_COLUMNS]
+    numeric_data.index = pd.DatetimeIndex(sliced_data["Date"].to_numpy(), name="Date")
+    return numeric_data
+
+
+# The pandas offsets matching each resample rule (used for the index of the binned data)
+_BIN_OFFSETS = {"W": pd.offsets.Week(weekday=6), "ME": pd.offsets.MonthEnd()}
+
+
+def _get_bin_numbers(data, start_index, end_index, rule):
+    """
+    Gets which week or month each row of a slice falls in, numbered so that one week or month
+    after another differ by 1
+    """
+    days = _get_dates_as_integers(data)[start_index:end_index + 1] // _NANOSECONDS_PER_DAY
+    if rule == "W":
+        # Weeks run from Monday to Sunday like pandas' "W" (1970-01-01 was a Thursday)
+        return (days + 3) // 7
+    return days.astype("datetime64[D]").astype("datetime64[M]").view(np.int64)
+
+
+def _get_bin_labels(bin_numbers, rule):
+    """
+    Gets the last day of each given week or month, which is how pandas labels them
+    """
+    if rule == "W":
+        last_days = (bin_numbers * 7 + 3).astype("datetime64[D]")
+    else:
+        last_days = (bin_numbers + 1).astype("datetime64[M]").astype("datetime64[D]") - 1
+    return last_days.astype("datetime64[ns]")
+
+
+def _add_up_bins(data, start_index, end_index, rule, aggregation):
+    """
+    Sums or averages a slice of the database over each week or month with np.add.reduceat,
+    skipping missing values like pandas does
+    (None if a week or month in the slice has no days, as pandas would keep it but reduceat can't)
+    """
+    bin_numbers = _get_bin_numbers(data, start_index, end_index, rule)
+
+    # Finds the first row of each week or month in the slice
+    is_bin_start = np.empty(bin_numbers.size, dtype=bool)
+    is_bin_start[0] = True
+    np.not_equal(bin_numbers[1:], bin_numbers[:-1], out=is_bin_start[1:])
+    bin_starts = np.flatnonzero(is_bin_start)
+    if np.any(np.diff(bin_numbers[bin_starts]) != 1):
+        return None
+    num_days = np.diff(bin_starts, append=bin_numbers.size)
+
+    binned = {}
+    for column in _NUMERIC_COLUMNS:
+        values = data[column].to_numpy()[start_index:end_index + 1]
+        num_values = num_days
+
+        # Missing values are added up as 0 and left out of the number of values averaged over
+        if values.dtype.kind == "f":
+            is_missing = np.isnan(values)
+            if is_missing.any():
+                values = np.where(is_missing, 0.0, values)
+                num_values = num_days - np.add.reduceat(is_missing, bin_starts, dtype=np.intp)
+
+        totals = np.add.reduceat(values, bin_starts)
+        if aggregation == "sum":
+            binned[column] = totals
+        else:
+            # Weeks or months with no values average to NaN, as they do in pandas
+            with np.errstate(invalid="ignore"):
+                binned[column] = totals / num_values
+
+    index = pd.DatetimeIndex(
+        _get_bin_labels(bin_numbers[bin_starts], rule), name="Date", freq=_BIN_OFFSETS[rule]
+    )
+    return pd.DataFrame(binned, index=index)
+
+
+def _resample_slice(data, start_index, end_index, rule, aggregation):
+    """
+    Resamples a slice of the database
+    (worked out on every call rather than cached, as the dataframe can be edited between calls)
+    """
+    resampled = _add_up_bins(data, start_index, end_index, rule, aggregation)
+    if resampled is not None:
+        return resampled
+
+    # Only the asked for aggregation is worked out, as nothing needs the sums and averages of a slice together
+    resampled = _get_numeric_data(data, start_index, end_index).resample(rule)
+    return getattr(resampled, aggregation)()
+
+
+def _get_date_range(data, start_date, end_date):
+    """
+    Gets the first and last row numbers between given dates (None if the dates aren't valid)
+    """
+    start_index = _get_date_position(data, _parse_date(start_date))
+    if start_index is None:
         print("Invalid start_date")
         return None
-    elif end_date not in data["Date"].values:
+    end_index = _get_date_position(data, _parse_date(end_date))
+    if end_index is None:
         print("Invalid end_date")
         return None
 
-    # Defining the slice
-    start_index = data.index[data["Date"] == start_date].values[0]
-    end_index = data.index[data["Date"] == end_date].values[0]
-
     if end_index < start_index:
         print("end_date can not be before start_date")
         return None
 
+    return start_index, end_index
+
+
+def _get_target_values(data, target):
+    """
+    Gets the daily integrated currents of a given target as a NumPy array
+    (read from the dataframe every time so later changes to the column are seen)
+    """
+    return data[f"Milliamp-hours ({target})"].to_numpy()
+
+
+def get_sliced_data(data, start_date, end_date, frequency="Daily", is_averaged=False):
+    """
+    Gets a slice of the database between given dates
+    """
+    # Defining the slice
+    date_range = _get_date_range(data, start_date, end_date)
+    if date_range is None:
+        return None
+    start_index, end_index = date_range
+
     # Grabs the desired slice of the database
-    match frequency:
-        case "Daily":
-            used_data = data.iloc[start_index:end_index + 1]
-        case "Weekly":
-            if is_averaged:
-                used_data = (
-                    data.iloc[start_index:end_index + 1]
-                    .resample("W", on="Date")
-                    .mean(numeric_only=True)
-                )
-            else:
-                used_data = (
-                    data.iloc[start_index:end_index + 1]
-                    .resample("W", on="Date")
-                    .sum(numeric_only=True)
-                )
-        case "Monthly":
-            if is_averaged:
-                used_data = (
-                    data.iloc[start_index:end_index + 1]
-                    .resample("M", on="Date")
-                    .mean(numeric_only=True)
-                )
-            else:
-                used_data = (
-                    data.iloc[start_index:end_index + 1]
-                    .resample("M", on="Date")
-                    .sum(numeric_only=True)
-                )
-        case _:
-            print("Invalid frequency\n(Only: Daily, Weekly, or Monthly allowed)")
-            return None
+    if frequency == "Daily":
+        return data.iloc[start_index:end_index + 1]
 
-    return used_data
+    try:
+        rule, aggregation = _RESAMPLE_METHODS[(frequency, bool(is_averaged))]
+    except KeyError:
+        print("Invalid frequency\n(Only: Daily, Weekly, or Monthly allowed)")
+        return None
+
+    return _resample_slice(data, start_index, end_index, rule, aggregation)
+
+
+def _make_daily_getter(target):
+    """
+    Makes a function that gets the daily integrated currents of one target between two row numbers
+    (the target's column name is bound here so it isn't built on every call)
+    """
+    column = f"Milliamp-hours ({target})"
+
+    def get_daily_integrated_current(data, start_index, end_index, is_summed):
+        values = data[column].to_numpy()[start_index:end_index + 1]
+        return values.sum() if is_summed else values
+
+    return get_daily_integrated_current
+
+
+_DAILY_GETTERS = {target: _make_daily_getter(target) for target in ("Sync", "TS-1", "TS-2")}
 
 
 def get_integrated_current(data, start_date, end_date=None, target="TS-1", valid_targets=("Sync", "TS-1", "TS-2"),
@@ -155,23 +361,27 @@ def get_integrated_current(data, start_date, end_date=None, target="TS-1", valid
         print("Invalid target")
         return None
     if end_date is None:
-        start_date = pd.to_datetime(start_date)
-        if start_date not in data["Date"].values:
+        start_index = _get_date_position(data, _parse_date(start_date))
+        if start_index is None:
             print("Invalid start_date")
             return None
         # Returns the integrated current for a given date
-        return data[data["Date"] == start_date][f"Milliamp-hours ({target})"].values[0]
+        return _get_target_values(data, target)[start_index]
     else:
-        if target not in valid_targets:
-            print("Invalid target")
-            return None
+        # Gets the daily values straight from the column's array without slicing the dataframe
+        if frequency == "Daily":
+            date_range = _get_date_range(data, start_date, end_date)
+            if date_range is None:
+                return None
+            start_index, end_index = date_range
+            return _DAILY_GETTERS[target](data, start_index, end_index, is_summed)
 
         used_data = get_sliced_data(
             data, start_date, end_date, frequency=frequency, is_averaged=is_averaged
         )
 
         if used_data is not None:
-            integrated_currents = used_data[f"Milliamp-hours ({target})"].values
+            integrated_currents = used_data[f"Milliamp-hours ({target})"].to_numpy()
 
             # Returns the sum of the integrated current for a range of given dates
             if is_summed:
@@ -181,11 +391,93 @@ def get_integrated_current(data, start_date, end_date=None, target="TS-1", valid
             return integrated_currents
 
 
-def is_beam_on(data, date, target="TS-1"):
+def is_beam_on(data, date, target="TS-1", valid_targets=("Sync", "TS-1", "TS-2")):
     """
     Checks whether the beam was on for a given date
     """
-    return get_integrated_current(data, date, target=target, is_summed=True) > 0
+    if target not in valid_targets:
+        print("Invalid target")
+        return None
+
+    position = _get_date_position(data, _parse_date(date))
+    if position is None:
+        print("Invalid date")
+        return None
+
+    # Compares the one value rather than reading a precomputed mask, so edits to the dataframe are seen
+    return bool(_get_target_values(data, target)[position] > 0)
+
+
+def _beam_mask_numpy(values, positions):
+    """
+    Checks whether each row number has a positive value (rows numbered -1 are treated as off)
+    """
+    is_found = positions >= 0
+    mask = np.zeros(positions.size, dtype=np.bool_)
+    mask[is_found] = values[positions[is_found]] > 0
+    return mask
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _beam_mask_numba(values, positions):
+        """
+        Checks whether each row number has a positive value (rows numbered -1 are treated as off)
+        """
+        mask = np.empty(positions.size, dtype=np.bool_)
+        for k in range(positions.size):
+            i = positions[k]
+            mask[k] = values[i] > 0 if i >= 0 else False
+        return mask
+
+    _beam_mask = _beam_mask_numba
+else:
+    _beam_mask = _beam_mask_numpy
+
+
+def is_beam_on_batch(data, dates, target="TS-1", valid_targets=("Sync", "TS-1", "TS-2")):
+    """
+    Checks whether the beam was on for each of a list of dates (or a single date)
+    (dates that aren't in the data count as the beam being off)
+    """
+    if target not in valid_targets:
+        print("Invalid target")
+        return None
+
+    known_dates = _get_dates_as_integers(data)
+    dates = pd.to_datetime(np.atleast_1d(dates)).to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+    # Finds the row number of every date in one binary search, marking missing dates with -1
+    # (the dates are put in order first if the dataframe isn't sorted)
+    order = None if _is_monotonic(known_dates) else np.argsort(known_dates, kind="stable")
+    sorted_dates = known_dates if order is None else known_dates[order]
+    positions = np.searchsorted(sorted_dates, dates)
+    is_in_range = positions < sorted_dates.size
+    is_found = np.zeros(dates.size, dtype=np.bool_)
+    is_found[is_in_range] = sorted_dates[positions[is_in_range]] == dates[is_in_range]
+    if order is not None:
+        positions[is_found] = order[positions[is_found]]
+    positions[~is_found] = -1
+
+    return _beam_mask(_get_target_values(data, target), positions)
+
+
+# The figure and line reused by every plot (made on the first plot)
+_PLOT_FIGURE = None
+_PLOT_AXES = None
+_PLOT_LINE = None
+
+
+def _get_plot_line():
+    """
+    Gets the figure, axes and line that are reused for every plot, only making them if there isn't a figure open
+    """
+    global _PLOT_FIGURE, _PLOT_AXES, _PLOT_LINE
+    if _PLOT_FIGURE is None or not plt.fignum_exists(_PLOT_FIGURE.number):
+        _PLOT_FIGURE, _PLOT_AXES = plt.subplots(figsize=(15, 5))
+        (_PLOT_LINE,) = _PLOT_AXES.plot([], [], ":o")
+    return _PLOT_FIGURE, _PLOT_AXES, _PLOT_LINE
 
 
 def plot_integrated_current(data, start_date, end_date, target="TS-1", valid_targets=("Sync", "TS-1", "TS-2"),
@@ -209,10 +501,10 @@ def plot_integrated_current(data, start_date, end_date, target="TS-1", valid_tar
         data, start_date, end_date, frequency=frequency, is_averaged=is_averaged
     )
     if frequency == "Daily":
-        dates = used_data["Date"]
+        dates = used_data["Date"].to_numpy()
     else:
-        dates = used_data[f"Milliamp-hours ({target})"].keys().values
-    integrated_currents = used_data[f"Milliamp-hours ({target})"].values
+        dates = used_data.index.to_numpy()
+    integrated_currents = used_data[f"Milliamp-hours ({target})"].to_numpy()
 
     # Warning:
     # If enabled, this will make the plotting slower and will produce a larger but more accurate graph
@@ -221,35 +513,36 @@ def plot_integrated_current(data, start_date, end_date, target="TS-1", valid_tar
         if is_shown:
             plt.rcParams["figure.dpi"] = 300
 
-    plt.tight_layout()
-    plt.figure(figsize=(15, 5))
+    figure, axes, line = _get_plot_line()
+    if is_high_resolution and is_shown:
+        figure.set_dpi(300)
 
-    start_date = pd.to_datetime(start_date).strftime(date_format)
-    end_date = pd.to_datetime(end_date).strftime(date_format)
+    start_date = _format_date(start_date, date_format)
+    end_date = _format_date(end_date, date_format)
 
-    plt.xlabel("Date")
+    axes.set_xlabel("Date")
     if is_averaged:
-        plt.ylabel(f"{target} {frequency} Average Integrated Current (Milliamp-hours)")
+        axes.set_ylabel(f"{target} {frequency} Average Integrated Current (Milliamp-hours)")
         if file_name is None:
             file_name = f"graphs/{target}_averaged_{start_date}_to_{end_date}_{frequency}_Integrated_Currents.png"
     else:
-        plt.ylabel(f"{target} {frequency} Integrated Current (Milliamp-hours)")
+        axes.set_ylabel(f"{target} {frequency} Integrated Current (Milliamp-hours)")
         if file_name is None:
             file_name = f"graphs/{target}_{start_date}_to_{end_date}_{frequency}_Integrated_Currents.png"
 
-    plt.plot(dates, integrated_currents, ":o")
-
-    if not os.path.isdir("graphs"):
-        os.mkdir("graphs")
+    # Swaps the data on the existing line rather than drawing a new one
+    axes.xaxis.update_units(dates)
+    line.set_data(dates, integrated_currents)
+    axes.relim()
+    axes.autoscale_view()
 
     if is_saved:
-        plt.savefig(file_name, bbox_inches="tight")
+        os.makedirs("graphs", exist_ok=True)
+        figure.savefig(file_name, bbox_inches="tight")
         print(f"Saved {file_name}")
 
     if is_shown:
         plt.show()
-    else:
-        plt.clf()
 
 
 def get_num_protons(
@@ -266,7 +559,6 @@ def get_num_protons(
     """
     Returns a list of the number of protons per specified amount of time (need to double check)
     """
-    proton_charge = 1.6e-19
     integrated_current = get_integrated_current(
         data,
         start_date,
@@ -277,23 +569,21 @@ def get_num_protons(
         is_averaged=is_averaged,
         is_summed=is_summed,
     )
-    num_protons = (integrated_current * (1e-3)) / proton_charge
-
+    # Folds the per second conversion into the same constant so the data is only multiplied once
     if per_second:
-        return num_protons / 86400
+        return integrated_current * (_MILLIAMP_HOURS_TO_NUM_PROTONS / 86400)
 
-    return num_protons
+    return integrated_current * _MILLIAMP_HOURS_TO_NUM_PROTONS
 
 
 def get_average_power(data, start_date, end_date=None, target="TS-1", valid_targets=("Sync", "TS-1", "TS-2"),
                       frequency="Daily", is_averaged=False, is_summed=False, voltage=800,
-                      voltage_unit_factor=(1e6)*(1.6e-19), current_unit_factor=(1e-3)/86400):
+                      voltage_unit_factor=MEV_TO_JOULES, current_unit_factor=MILLIAMP_HOURS_TO_AMPS):
 
-    # Default: MeV -> J
-    voltage *= voltage_unit_factor
+    # Combines the voltage and both unit conversions into one factor so the data is only multiplied once
+    power_factor = voltage * voltage_unit_factor * current_unit_factor
 
-    # Default: mAh -> A
-    integrated_current = current_unit_factor * get_integrated_current(
+    integrated_current = get_integrated_current(
         data,
         start_date,
         end_date=end_date,
@@ -304,13 +594,11 @@ def get_average_power(data, start_date, end_date=None, target="TS-1", valid_targ
         is_summed=is_summed,
     )
 
-    return voltage * integrated_current
+    return power_factor * integrated_current
 
 
 if __name__ == "__main__":
-    data = text_to_pandas_dataframe("mahdy3-op-by-day_to-08jun25.txt")
-
-    data_integrity_check(data)
+    data = load_and_prepare("mahdy3-op-by-day_to-08jun25.txt")
 
     start_date = "16-Apr-1991"
     end_date = "28-Jul-1991"
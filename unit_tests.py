@@ -1,4 +1,6 @@
 from txt_to_pandas_dataframe import *
+import os
+import tempfile
 import unittest
 
 
@@ -15,6 +17,46 @@ class Test_data_Processing(unittest.TestCase):
     off_date = "01-Jan-1991"
     wrong_date = "13-Sep-1341"
 
+    def test_find_decreasing_value(self):
+        """
+        Tests that decreasing values are only found in columns known to
+        decrease (the cumulative Sync column resets on 04-Sep-2005)
+        """
+        self.assertFalse(find_decreasing_value(self.data, "Modified Julian day no."))
+        self.assertTrue(
+            find_decreasing_value(self.data, "Cumulative milliamp-hours (Sync)")
+        )
+
+    def test_load_and_prepare(self):
+        """
+        Tests that loading and checking the data in one go gives data that
+        can be looked up by date, and that a log whose cumulative columns
+        don't match its daily values is rejected
+        """
+        data = load_and_prepare("mahdy3-op-by-day_to-08jun25.txt")
+
+        self.assertEqual(len(data), len(self.data))
+        self.assertTrue(data["Date"].is_monotonic_increasing)
+        self.assertEqual(
+            get_integrated_current(data, self.start_date),
+            get_integrated_current(self.data, self.start_date),
+        )
+
+        # Adds 10 mAh to one day of TS-1 without changing the cumulative TS-1 column
+        with open("mahdy3-op-by-day_to-08jun25.txt") as file:
+            lines = file.readlines()
+        values = lines[200].split()
+        values[3] = f"{float(values[3]) + 10:.3f}"
+        lines[200] = "    ".join(values) + "\n"
+
+        with tempfile.TemporaryDirectory() as directory:
+            corrupted_file = os.path.join(directory, "corrupted.txt")
+            with open(corrupted_file, "w") as file:
+                file.writelines(lines)
+
+            with self.assertRaises(AssertionError):
+                load_and_prepare(corrupted_file)
+
     def test_basic_single_date_get_integrated_current(self):
         """
         Tests to see whether the a succesful current is gathered for a known
@@ -47,8 +89,27 @@ class Test_data_Processing(unittest.TestCase):
             self.data, self.start_date, self.end_date, is_summed=True
         )
 
+        self.assertEqual(integrated_currents.dtype, np.float64)
         self.assertEqual(integrated_currents.sum(), integrated_current_sum)
 
+    def test_unrounded_get_integrated_current(self):
+        """
+        Tests that integrated currents with more than the log's 3 decimal
+        places are returned as they are, and agree with the daily slice
+        """
+        data = self.data.copy()
+        data["Milliamp-hours (TS-1)"] = data["Milliamp-hours (TS-1)"] / 7
+        sliced_data = get_sliced_data(data, self.start_date, self.end_date)
+
+        self.assertEqual(
+            get_integrated_current(data, self.start_date),
+            sliced_data["Milliamp-hours (TS-1)"].iloc[0],
+        )
+        np.testing.assert_array_equal(
+            get_integrated_current(data, self.start_date, self.end_date),
+            sliced_data["Milliamp-hours (TS-1)"].to_numpy(),
+        )
+
     def test_is_beam_on(self):
         """
         Tests to see whether the code is properly registering the beam being
@@ -57,6 +118,39 @@ class Test_data_Processing(unittest.TestCase):
         self.assertTrue(is_beam_on(self.data, self.start_date))
         self.assertFalse(is_beam_on(self.data, self.off_date))
 
+    def test_is_beam_on_batch(self):
+        """
+        Tests that checking a list of dates at once agrees with checking
+        them one at a time, and that dates not in the data count as off
+        """
+        beam_on = is_beam_on_batch(
+            self.data, [self.start_date, self.off_date, "16-Apr-1891"]
+        )
+
+        self.assertEqual(
+            list(beam_on),
+            [is_beam_on(self.data, self.start_date), is_beam_on(self.data, self.off_date), False],
+        )
+        self.assertEqual(list(is_beam_on_batch(self.data, self.start_date)), [True])
+
+    def test_unsorted_date_lookups(self):
+        """
+        Tests that dates are still found in data that isn't sorted by date,
+        and that data_integrity_check rejects it
+        """
+        data = self.data.iloc[::-1]
+
+        self.assertEqual(
+            get_integrated_current(data, self.start_date),
+            get_integrated_current(self.data, self.start_date),
+        )
+        self.assertEqual(
+            list(is_beam_on_batch(data, [self.start_date, self.off_date, "16-Apr-1891"])),
+            [True, False, False],
+        )
+        with self.assertRaises(AssertionError):
+            data_integrity_check(data)
+
     def test_condensed_data_size(self):
         """
         Tests the size of the collected data
@@ -72,6 +166,39 @@ class Test_data_Processing(unittest.TestCase):
         self.assertTrue(6 < len(daily) / len(weekly) < 8)
         self.assertTrue(3 < len(weekly) / len(monthly) < 5)
 
+    def test_resampled_get_sliced_data(self):
+        """
+        Tests that weekly and monthly slices match resampling the daily data
+        with pandas, for slices starting and ending part way through a week
+        or month, for data with a missing month and for data with missing
+        values
+        """
+        rules = {"Weekly": "W", "Monthly": "ME"}
+        columns = ["Milliamp-hours (Sync)", "Milliamp-hours (TS-1)", "Milliamp-hours (TS-2)"]
+        data_with_gap = self.data.drop(self.data.index[120:160])
+        # Leaves out one day and a whole week of TS-1
+        data_with_nan = self.data.copy()
+        data_with_nan.loc[[105, *range(140, 154)], "Milliamp-hours (TS-1)"] = np.nan
+
+        for data, start_index, end_index in [
+            (self.data, 100, 200),
+            (self.data, 3, 1000),
+            (data_with_gap, 100, 200),
+            (data_with_nan, 100, 200),
+        ]:
+            start_date = data["Date"].iloc[start_index].strftime("%d-%b-%Y")
+            end_date = data["Date"].iloc[end_index].strftime("%d-%b-%Y")
+            for frequency, rule in rules.items():
+                for is_averaged in (False, True):
+                    with self.subTest(start_date=start_date, frequency=frequency, is_averaged=is_averaged):
+                        resampled = data.iloc[start_index:end_index + 1].resample(rule, on="Date")
+                        expected = resampled.mean() if is_averaged else resampled.sum()
+                        sliced_data = get_sliced_data(data, start_date, end_date, frequency, is_averaged)
+
+                        pd.testing.assert_frame_equal(
+                            sliced_data[columns], expected[columns], check_dtype=False, check_exact=False, rtol=1e-5
+                        )
+
     def test_summing_basic_get_num_protons(self):
         """
         Tests the summing argument for get_num_protons